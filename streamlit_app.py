@@ -11,59 +11,386 @@ into JSON format. This JSON data is then sent via an API request to be inserted
 the Snowflake storage service.
 """
 
-import json
-import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import gzip
+import orjson
+import os
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import re
 import requests
-import simplejson
+from requests.adapters import HTTPAdapter
 import streamlit as st
+from urllib3.util.retry import Retry
 
 
 # Valid CSV filenames
 valid_filenames = ["hired_employees.csv", "departments.csv", "jobs.csv"]
 
-# Desired dtypes for columns of CSV filenames
-desired_dtypes = {
-    "hired_employees.csv": {
-        0: ['int'],
-        1: ['object'],
-        2: ['object'],
-        3: ['int', 'float'],
-        4: ['int', 'float']
-    },
-    "departments.csv": {
-        0: ['int'],
-        1: ['object']
-    },
-    "jobs.csv": {
-        0: ['int'],
-        1: ['object']
-    }
+# Expected number of columns of CSV filenames
+expected_ncols = {
+    "hired_employees.csv": 5,
+    "departments.csv": 2,
+    "jobs.csv": 2
 }
 
+# Expected dtype kinds for columns of CSV filenames, one character per column ('i': integer, 'O': object, 'f': float)
+expected_kinds = {
+    "hired_employees.csv": "iOOff",
+    "departments.csv": "iO",
+    "jobs.csv": "iO"
+}
+
+# Dtype kinds accepted for each expected dtype kind without casting the column. Integer columns without
+# missing values are parsed as int64, so integers are accepted for the float department_id and job_id columns
+accepted_kinds = {
+    'i': frozenset('i'),
+    'f': frozenset('fi'),
+    'O': frozenset('O')
+}
+
+# Arrow column types used to parse CSV filenames (columns are autogenerated as f0, f1, ...).
+# Integer columns with missing values are converted to float64 by pandas, as pd.read_csv does
+column_types = {
+    "hired_employees.csv": {'f0': pa.int64(), 'f1': pa.string(), 'f2': pa.string(), 'f3': pa.int64(), 'f4': pa.int64()},
+    "departments.csv": {'f0': pa.int64(), 'f1': pa.string()},
+    "jobs.csv": {'f0': pa.int64(), 'f1': pa.string()}
+}
+
+# Map Arrow strings to the PyArrow-backed pandas string dtype instead of Python str objects
+string_types_mapper = {pa.string(): pd.StringDtype("pyarrow")}.get
+
+# Dtypes to cast the columns whose kind is not accepted. Arrow column_types fix the other columns to kinds
+# that are always accepted, only an id column with missing values is converted to float64 and must be cast back
+cast_dtypes = {
+    "hired_employees.csv": {'id': 'int64'},
+    "departments.csv": {'id': 'int64'},
+    "jobs.csv": {'id': 'int64'}
+}
+
+# Accepted datetime formats for the datetime column, tried in order
+datetime_formats = ["%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+
+# Number of records of the sub DataFrames validated before inserting, the first one is also used to size the requests
+sample_records = 10_000
+
+# Maximum number of records sent on each API request (set MAX_RECORDS=1000 to go back to 1000-record requests)
+max_records = int(os.environ.get("MAX_RECORDS", 50_000))
+if max_records < 1:
+    raise ValueError(f"MAX_RECORDS must be a positive number of records, got {max_records}.")
+
+# Target size in bytes of the JSON body of each API request, 60% of the 10 MB payload limit of API Gateway
+target_body_bytes = int(os.environ.get("TARGET_BODY_BYTES", 6_000_000))
+if target_body_bytes < 1:
+    raise ValueError(f"TARGET_BODY_BYTES must be a positive number of bytes, got {target_body_bytes}.")
+
+# Maximum number of API requests sent concurrently
+max_workers = 8
+
+# Compress request bodies with gzip, disabled by default (enable it only if the API decodes Content-Encoding: gzip)
+compress_requests = os.environ.get("COMPRESS_REQUESTS", "false").lower() in ("1", "true", "yes")
+compress_level = 3
+
 # Column names for CSV filenames
 column_names = {
-    "hired_employees.csv": {
-        0: 'id',
-        1: 'name',
-        2: 'datetime',
-        3: 'department_id',
-        4: 'job_id'
-    },
-    "departments.csv": {
-        0: 'id',
-        1: 'department'
-    },
-    "jobs.csv": {
-        0: 'id',
-        1: 'job'
-    }
+    "hired_employees.csv": ['id', 'name', 'datetime', 'department_id', 'job_id'],
+    "departments.csv": ['id', 'department'],
+    "jobs.csv": ['id', 'job']
 }
 
 
+def is_empty_file(file):
+    """
+    Check if an uploaded file has no data, i.e. it is empty or only contains whitespace (e.g. blank lines).
+
+    Parameters:
+    - file: Streamlit UploadedFile (or any BytesIO) of CSV uploaded
+
+    Returns:
+    - True if the file has no data, otherwise False
+    """
+    with file.getbuffer() as buffer:
+        return re.search(rb"\S", buffer) is None
+
+
+@st.cache_resource
+def get_api_session():
+    """
+    Create an HTTP session shared across Streamlit reruns to reuse keep-alive connections to the API.
+
+    Returns:
+    - requests Session with a connection pool and retries on connection errors
+    """
+    session = requests.Session()
+    # Only connection errors are retried, a failed POST may already have inserted its records
+    retries = Retry(connect=3, backoff_factor=0.3)
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retries))
+    return session
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def validate_csv_file(file_id, filename, _file):
+    """
+    Validate every sub DataFrame of an uploaded CSV file before anything is sent to the API,
+    cached per upload so Streamlit reruns skip the parsing.
+
+    Parameters:
+    - file_id: Streamlit id of the uploaded file, used as cache key (changes on every new upload)
+    - filename: filename of CSV uploaded
+    - _file: file-like object of CSV uploaded (not hashed)
+
+    Returns:
+    - Tuple with the validation result, the first transformed DataFrame (None if invalid), the number of records
+      and an error message
+    """
+    if is_empty_file(_file):
+        return False, None, 0, "Empty CSV file. Please upload a file with data."
+    first_df = None
+    records = 0
+    try:
+        for elem_df in read_csv_chunks(filename, open_uploaded_file(_file), sample_records):
+            valid_df, transformed_df, valid_message = validate_df(filename, elem_df)
+            if not valid_df:
+                return False, None, 0, f"{valid_message} (records {records + 1} to {records + len(elem_df)})"
+            if first_df is None:
+                first_df = transformed_df
+            records += len(elem_df)
+    except pa.ArrowInvalid as exception:
+        return False, None, 0, f"The file '{filename}' could not be parsed. Details: {exception}"
+    if first_df is None:
+        return False, None, 0, "Empty CSV file. Please upload a file with data."
+    return True, first_df, records, ""
+
+
+def send_json_data(session, api_url, headers, json_data):
+    """
+    Send JSON data to the API to be inserted into Snowflake, compressed with gzip if compress_requests is enabled.
+
+    Parameters:
+    - session: requests Session used to send the request
+    - api_url: URL of the API
+    - headers: Headers of the request
+    - json_data: JSON body (bytes) formatted for API insertion
+
+    Returns:
+    - Tuple with the insertion result and the message of the API
+    """
+    if compress_requests:
+        json_data = gzip.compress(json_data, compresslevel=compress_level)
+        headers = {**headers, 'Content-Encoding': 'gzip'}
+    try:
+        response = session.post(api_url, headers=headers, data=json_data)
+    except requests.RequestException as exception:
+        return False, f"The request to the API failed. Details: {exception}"
+    if not 200 <= response.status_code < 300:
+        # Error responses may not be JSON (e.g. API Gateway errors)
+        try:
+            final_message = orjson.loads(response.content).get("message", f"HTTP {response.status_code}")
+        except (orjson.JSONDecodeError, AttributeError):
+            final_message = f"HTTP {response.status_code}: {response.text[:200]}"
+        return False, final_message
+    # The API reports insertion errors in the status of the response body
+    try:
+        response_text = orjson.loads(response.content)
+        return response_text["status"] != "error", response_text["message"]
+    except (orjson.JSONDecodeError, TypeError, KeyError):
+        return False, f"Unexpected response of the API (HTTP {response.status_code}): {response.text[:200]}"
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_records_per_request(file_id, filename, _df):
+    """
+    Estimate the number of records per API request so that each JSON body is close to target_body_bytes,
+    cached per upload so the sample is serialized only once.
+
+    Parameters:
+    - file_id: Streamlit id of the uploaded file, used as cache key (changes on every new upload)
+    - filename: filename of CSV uploaded
+    - _df: Sample pandas DataFrame, the first sub DataFrame of the CSV uploaded (not hashed)
+
+    Returns:
+    - Number of records per request, between 1 and max_records
+    """
+    body_bytes = len(elem_df_serializers[filename](_df))
+    records = int(target_body_bytes * len(_df) / body_bytes)
+    return max(1, min(max_records, records))
+
+
+def insert_elem_df(filename, elem_df, session, api_url, headers):
+    """
+    Convert a sub DataFrame (already validated with validate_csv_file) to JSON and send it using the API.
+
+    Parameters:
+    - filename: filename of CSV uploaded
+    - elem_df: pandas sub DataFrame of CSV uploaded
+    - session: requests Session used to send the request
+    - api_url: URL of the API
+    - headers: Headers of the request
+
+    Returns:
+    - Tuple with the insertion result and the message of the API
+    """
+    json_data = elem_df_serializers[filename](elem_df)
+    return send_json_data(session, api_url, headers, json_data)
+
+
+def insert_csv_file(filename, file, api_url, headers, progress_bar, total_records, records_per_request):
+    """
+    Stream a CSV file in sub DataFrames of records_per_request records and send them using the API,
+    keeping up to max_workers requests in flight and stopping at the first error. The file must have been
+    validated with validate_csv_file, so that no record is sent if any sub DataFrame is invalid.
+
+    Parameters:
+    - filename: filename of CSV uploaded
+    - file: file-like object of CSV uploaded
+    - api_url: URL of the API
+    - headers: Headers of the requests
+    - progress_bar: Streamlit progress bar updated as sub DataFrames are inserted
+    - total_records: Number of records of the CSV file, used to compute the progress
+    - records_per_request: Number of records sent on each API request
+
+    Returns:
+    - Tuple with the insertion result and the final message
+    """
+    all_inserted = True
+    final_message = ""
+    inserted_chunks = 0
+    inserted_records = 0
+    # Number of records of each sub DataFrame sent to the API
+    chunk_records = {}
+    session = get_api_session()
+    chunks = read_csv_chunks(filename, open_uploaded_file(file), records_per_request)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        chunks_exhausted = False
+        try:
+            while all_inserted:
+                # The script thread only parses the CSV, serialization and requests run on the workers
+                while not chunks_exhausted and len(pending) < max_workers:
+                    elem_df = next(chunks, None)
+                    if elem_df is None:
+                        chunks_exhausted = True
+                        break
+                    future = executor.submit(insert_elem_df, filename, elem_df, session, api_url, headers)
+                    chunk_records[future] = len(elem_df)
+                    pending.add(future)
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        inserted, message = future.result()
+                    except Exception as exception:
+                        inserted, message = False, f"The sub DataFrame could not be inserted. Details: {exception}"
+                    if not inserted:
+                        all_inserted = False
+                        final_message = message
+                    else:
+                        inserted_chunks += 1
+                        inserted_records += chunk_records[future]
+                        if all_inserted:
+                            final_message = message
+                progress_bar.progress(min(inserted_records / max(total_records, 1), 1.0),
+                                      text=f"Inserted {inserted_chunks} sub DataFrames...")
+        finally:
+            # Fail fast: requests not yet started are not sent after an error
+            for future in pending:
+                future.cancel()
+    if not all_inserted:
+        # Requests already running when the error arrived have finished with the executor, count them too
+        inserted_chunks += sum(1 for future in pending
+                               if not future.cancelled() and future.exception() is None and future.result()[0])
+        final_message = f"{final_message} ({inserted_chunks} sub DataFrames were inserted before the error)"
+    return all_inserted, final_message
+
+
+def open_uploaded_file(file):
+    """
+    Open an uploaded file as an Arrow buffer reader over its in-memory bytes, without copying them.
+
+    Parameters:
+    - file: Streamlit UploadedFile (or any BytesIO) of CSV uploaded
+
+    Returns:
+    - pyarrow BufferReader positioned at the start of the file
+    """
+    return pa.BufferReader(pa.py_buffer(file.getbuffer()))
+
+
+def read_csv_chunks(filename, file, records_per_chunk):
+    """
+    Read a CSV file without header as a stream of pandas DataFrames using the Arrow CSV reader.
+
+    Parameters:
+    - filename: filename of CSV uploaded
+    - file: file-like object or Arrow input stream of CSV uploaded
+    - records_per_chunk: Number of records of each DataFrame (the last one may have fewer)
+
+    Returns:
+    - Generator of pandas DataFrames of records_per_chunk rows, with the column names of the filename
+    """
+    # Autogenerate column names to treat the first row as data, the CSV doesn't have column names
+    read_options = pacsv.ReadOptions(autogenerate_column_names=True)
+    convert_options = pacsv.ConvertOptions(column_types=column_types[filename], strings_can_be_null=True)
+    reader = pacsv.open_csv(file, read_options=read_options, convert_options=convert_options)
+    names = column_names[filename]
+    # Record batches are buffered until they hold at least records_per_chunk records
+    buffered_batches = []
+    buffered_records = 0
+    batches = iter(reader)
+    while True:
+        batch = next(batches, None)
+        if batch is not None:
+            buffered_batches.append(batch)
+            buffered_records += batch.num_rows
+            if buffered_records < records_per_chunk:
+                continue
+        elif not buffered_records:
+            break
+        # Convert the buffered records once, keeping strings in Arrow memory, and yield row slices of them
+        # (views, not copies); the records left over are kept for the next chunk. Transformations of the slices
+        # must return new DataFrames (df.astype) instead of assigning columns in place, which warns on pandas 2
+        table = pa.Table.from_batches(buffered_batches)
+        records = buffered_records if batch is None else buffered_records - buffered_records % records_per_chunk
+        buffered_batches = table.slice(records).to_batches()
+        buffered_records -= records
+        batch_df = table.slice(0, records).to_pandas(types_mapper=string_types_mapper)
+        # Assign the final column names while reading, unless the number of columns is not the expected one
+        batch_df.columns = names if batch_df.shape[1] == len(names) else range(batch_df.shape[1])
+        for offset in range(0, records, records_per_chunk):
+            yield batch_df.iloc[offset:offset + records_per_chunk]
+
+
+def validate_df(filename, df):
+    """
+    Validate the number of columns, data types and datetime values of a DataFrame.
+
+    Parameters:
+    - filename: filename of CSV uploaded
+    - df: pandas DataFrame of CSV uploaded
+
+    Returns:
+    - Tuple with the validation result, the transformed DataFrame (None if invalid) and an error message
+    """
+    # Validate the number of columns based on the filename
+    expected_columns = expected_ncols[filename]
+    if df.shape[1] != expected_columns:
+        return False, None, f"Invalid number of columns. Expected {expected_columns} columns."
+    # Validate data types of columns based on the filename
+    valid_transformation, df, transform_message = transform_df_dtypes(filename, df)
+    if not valid_transformation:
+        return False, None, transform_message
+    # Valid datetime column
+    valid_datetime_colum, valid_datetime_message = is_valid_datetime_column(df, 'datetime')
+    if not valid_datetime_colum:
+        return False, None, valid_datetime_message
+    return True, df, ""
+
+
 def transform_df_dtypes(filename, df):
     """
-    Transform data types of columns in a DataFrame based on a dictionary of specified data types.
+    Transform data types of columns in a DataFrame whose dtype kinds differ from the expected ones.
 
     Parameters:
     - filename: filename of CSV uploaded
@@ -72,16 +399,17 @@ def transform_df_dtypes(filename, df):
     Returns:
     - Transformed DataFrame or None if an error occurs
     """
-    desired_dtypes_by_filename = desired_dtypes[filename]
     try:
-        for column, dtype_list in desired_dtypes_by_filename.items():
-            correct_dtype = True
-            for desired_dtype in dtype_list:
-                if desired_dtype not in str(df[column].dtype):
-                    correct_dtype = False
-                    break
-                if not correct_dtype:
-                    df[column] = df[column].astype(dtype_list[column][0])
+        expected_kinds_by_filename = expected_kinds[filename]
+        actual_kinds = "".join(dtype.kind for dtype in df.dtypes)
+        if actual_kinds != expected_kinds_by_filename:
+            cast_dtypes_by_filename = cast_dtypes[filename]
+            # Cast only the columns whose dtype kind is not accepted for the expected one
+            df = df.astype({
+                column: cast_dtypes_by_filename[column]
+                for column, actual_kind, expected_kind in zip(df.columns, actual_kinds, expected_kinds_by_filename)
+                if actual_kind not in accepted_kinds[expected_kind]
+            })
         message = "The data types of CSV are correct."
         return True, df, message
     except Exception as exception:
@@ -89,45 +417,77 @@ def transform_df_dtypes(filename, df):
         return False, None, error_message
 
 
-def prepare_elem_df_for_api(table_name, df):
+def serialize_missing_value(obj):
+    """
+    Serialize the missing values of pandas string columns (pd.NA) as null, used as orjson default.
+
+    Parameters:
+    - obj: Object that orjson can not serialize
+
+    Returns:
+    - None for pd.NA, otherwise a TypeError is raised
+    """
+    if obj is pd.NA:
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def make_elem_df_serializer(filename):
     """
-    Prepare a pandas DataFrame for API insertion by converting it to JSON format and handling NaN values.
+    Build the function that prepares the pandas DataFrames of a CSV filename for API insertion.
+
+    The table name, column names and which columns are numeric are known for each filename, so they
+    are resolved once here instead of on every sub DataFrame.
 
     Parameters:
-    - table_name: Name of the table corresponding to the DataFrame.
-    - df: pandas DataFrame to be prepared for API insertion.
+    - filename: filename of CSV uploaded
 
     Returns:
-    - JSON data formatted for API insertion.
+    - Function converting a pandas DataFrame of the filename to a JSON body (bytes) formatted for API insertion
     """
-    # Convert the DataFrame to JSON
-    json_data = df.to_dict(orient="list")
+    table_name = filename.replace(".csv", "")
+    # Pairs of column name and whether the column is numeric, in the order of the CSV columns
+    columns = tuple((name, kind in "if") for name, kind in zip(column_names[filename], expected_kinds[filename]))
+    options = orjson.OPT_SERIALIZE_NUMPY
 
-    # Replace NaN for null
-    json_data = json.loads(simplejson.dumps(json_data, ignore_nan=True))
+    def prepare_elem_df_for_api(df):
+        # Numeric columns are serialized from their numpy arrays, string columns from Python lists
+        json_data = {name: df[name].to_numpy() if numeric else df[name].tolist() for name, numeric in columns}
+        # Convert to JSON, orjson serializes NaN as null and serialize_missing_value handles pd.NA
+        return orjson.dumps({"table": {table_name: json_data}}, default=serialize_missing_value, option=options)
 
-    # Prepare JSON data for API
-    json_data_for_api = {
-        "table": {
-            table_name: json_data
-        }
-    }
-    # json_data_for_api["table"] = {}
-    # json_data_for_api["table"][table_name] = json_data
-    return json_data_for_api
+    return prepare_elem_df_for_api
 
 
 def is_valid_datetime_column(df, column_name):
-    if df.shape[1] == 5:
-        try:
-            _ = pd.to_datetime(df[column_name])
-            return True, ""
-        except (ValueError, pd.errors.ParserError) as _:
-            error_message = f"The third column has invalid datetime values."
-            return False, error_message
+    """
+    Validate the datetime column of a DataFrame against the accepted datetime formats.
+
+    Parameters:
+    - df: pandas DataFrame of CSV uploaded
+    - column_name: Column of the DataFrame that holds the datetime values
+
+    Returns:
+    - Tuple with the validation result and an error message (empty if valid)
+    """
+    if column_name in df.columns:
+        column = df[column_name]
+        # Values already missing in the CSV are allowed, only unparseable values are rejected
+        invalid = column.notna()
+        for datetime_format in datetime_formats:
+            parsed = pd.to_datetime(column[invalid], format=datetime_format, errors="coerce", cache=True)
+            invalid.loc[parsed.index] = parsed.isna()
+            if not invalid.any():
+                return True, ""
+        error_message = "The third column has invalid datetime values."
+        return False, error_message
     return True, ""
 
 
+# Serializers of the pandas DataFrames of each CSV filename, built once at import
+elem_df_serializers = {filename: make_elem_df_serializer(filename) for filename in valid_filenames}
+
+
 if __name__ == "__main__":
     # Page setup
     st.title("Upload CSV and Insert into Snowflake")
@@ -146,72 +506,36 @@ if __name__ == "__main__":
             st.error("Invalid filename. Please select a valid CSV filename.")
         else:
             st.success("File uploaded successfully.")
-            # Read the CSV file into a pandas DataFrame
             try:
-                # Skip header to treat the first row as data if the CSV doesn't have column names
-                df = pd.read_csv(uploaded_file, header=None)
-                # Validate the number of columns based on the filename
-                expected_columns = 5 if uploaded_file.name == "hired_employees.csv" else 2
-                if df.shape[1] != expected_columns:
-                    st.error(f"Invalid number of columns. Expected {expected_columns} columns.")
+                # Validate the whole CSV file before sending anything to the API
+                valid_df, first_df, total_records, valid_message = validate_csv_file(uploaded_file.file_id,
+                                                                                     uploaded_file.name,
+                                                                                     uploaded_file)
+                if not valid_df:
+                    st.error(valid_message)
                 else:
-                    # Validate data types of columns based on the filename
-                    valid_transformation, df, transform_message = transform_df_dtypes(uploaded_file.name, df)
-                    if not valid_transformation:
-                        st.error(transform_message)
-                    else:
-                        # Valid datetime column
-                        valid_datetime_colum, valid_datetime_message = is_valid_datetime_column(df, 2)
-                        if not valid_datetime_colum:
-                            st.error(valid_datetime_message)
+                    # Display the DataFrame
+                    st.write("DataFrame head:")
+                    st.write(first_df)
+
+                    # Button to send the JSON to an API
+                    if st.button("Insert into Snowflake"):
+                        # API URL (replace with your own URL)
+                        api_url = "https://l9k2s37rid.execute-api.us-east-1.amazonaws.com/globant-challenge/receive-table-data"
+                        # Simulate a POST request to the API
+                        headers = {'Content-Type': 'application/json'}
+                        # Size the requests from the JSON body of the first sub DataFrame
+                        records_per_request = get_records_per_request(uploaded_file.file_id, uploaded_file.name,
+                                                                      first_df)
+                        progress_bar = st.progress(0.0, text="Wait for it...")
+                        all_inserted, final_message = insert_csv_file(uploaded_file.name, uploaded_file, api_url,
+                                                                      headers, progress_bar, total_records,
+                                                                      records_per_request)
+                        progress_bar.empty()
+                        # Final message
+                        if all_inserted:
+                            st.success(final_message)
                         else:
-                            # Rename columns
-                            column_names_by_filename = column_names[uploaded_file.name]
-                            df = df.rename(columns=column_names_by_filename)
-
-                            # Display the DataFrame
-                            st.write("DataFrame head:")
-                            st.write(df)
-
-                            # Split the DataFrame in sub DataFrames on 1000 records
-                            max_records = 1000
-                            splitted_df_list = np.array_split(df, range(max_records, len(df), max_records))
-
-                            # Table name
-                            table_name = uploaded_file.name.replace(".csv", "")
-
-                            json_data_for_api_list = []
-                            for elem_df in splitted_df_list:
-                                json_data_for_api = prepare_elem_df_for_api(table_name, elem_df)
-                                json_data_for_api_list.append(json_data_for_api)
-
-                            # TEST: Save JSON data for API
-                            # for idx, json_data_for_api in enumerate(json_data_for_api_list):
-                            #     json_filename = f"{table_name}_{idx + 1}.json"
-                            #     with open(json_filename, 'w') as json_file:
-                            #         json.dump(json_data_for_api, json_file, indent=None)
-
-                            # Button to send the JSON to an API
-                            if st.button("Insert into Snowflake"):
-                                # API URL (replace with your own URL)
-                                api_url = "https://l9k2s37rid.execute-api.us-east-1.amazonaws.com/globant-challenge/receive-table-data"
-                                # Simulate a POST request to the API
-                                headers = {'Content-Type': 'application/json'}
-                                # Send all data using the API
-                                all_inserted = True
-                                final_message = ""
-                                with st.spinner('Wait for it...'):
-                                    for json_data in json_data_for_api_list:
-                                        response = requests.post(api_url, headers=headers, json=json_data)
-                                        response_text = json.loads(response.text)
-                                        final_message = response_text["message"]
-                                        if response_text["status"] == "error":
-                                            all_inserted = False
-                                            break
-                                # Final message
-                                if all_inserted:
-                                    st.success(final_message)
-                                else:
-                                    st.error(final_message)
-            except pd.errors.EmptyDataError:
-                st.error("Empty CSV file. Please upload a file with data.")
+                            st.error(final_message)
+            except pa.ArrowInvalid as exception:
+                st.error(f"The file '{uploaded_file.name}' could not be parsed. Details: {exception}")